@@ -7,19 +7,38 @@ This prevents cookie expiration issues during long-running download operations.
 
 import time
 import logging
+import logging.handlers
+import queue
+import atexit
 import os
+import signal
+import threading
 import argparse
 from datetime import datetime, timedelta
 from download import export_firefox_cookies
 
 # Setup logging
+# Log records are enqueued and drained by a QueueListener thread so the
+# monitor loop never blocks on file I/O for logging.
+_log_queue = queue.Queue(-1)
+_log_formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
+_file_handler = logging.FileHandler('cookie_monitor.log')
+_file_handler.setFormatter(_log_formatter)
+_stream_handler = logging.StreamHandler()
+_stream_handler.setFormatter(_log_formatter)
+_log_listener = logging.handlers.QueueListener(
+    _log_queue, _file_handler, _stream_handler, respect_handler_level=True
+)
+_log_listener.start()
+atexit.register(_log_listener.stop)
+
+# force=True: importing download above already ran its basicConfig, and
+# without the flag this call would silently do nothing (root already has
+# handlers), leaving cookie_monitor.log empty and the listener idle
 logging.basicConfig(
     level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('cookie_monitor.log'),
-        logging.StreamHandler()
-    ]
+    handlers=[logging.handlers.QueueHandler(_log_queue)],
+    force=True,
 )
 logger = logging.getLogger(__name__)
 
@@ -36,54 +55,96 @@ class CookieMonitor:
         self.max_age_hours = max_age_hours
         self.cookies_file = 'cookies.txt'
         self.running = False
-        
-    def get_cookie_age(self):
+        self._stop_event = threading.Event()
+        self._refresh_done = threading.Event()
+        self._refresh_thread = None
+        self._refresh_success = False
+
+    def stop(self):
+        """Signal the monitor loop to exit at the next wait point."""
+        self.running = False
+        self._stop_event.set()
+
+    def _stat_cookies(self):
+        """Stat the cookies file once; returns None if it doesn't exist."""
+        try:
+            return os.stat(self.cookies_file)
+        except FileNotFoundError:
+            return None
+
+    def get_cookie_age(self, st=None):
         """Get the age of the cookies.txt file in hours."""
-        if not os.path.exists(self.cookies_file):
+        if st is None:
+            st = self._stat_cookies()
+        if st is None:
             return float('inf')  # File doesn't exist, consider it very old
-        
-        file_time = os.path.getmtime(self.cookies_file)
-        age_seconds = time.time() - file_time
+
+        age_seconds = time.time() - st.st_mtime
         return age_seconds / 3600  # Convert to hours
-    
-    def should_refresh_cookies(self):
-        """Determine if cookies should be refreshed based on age."""
-        age_hours = self.get_cookie_age()
-        
+
+    def should_refresh_cookies(self, st=None):
+        """Determine if cookies should be refreshed based on age.
+
+        Returns (needs_refresh, age_hours) so callers can log the age
+        without statting the file again.
+        """
+        age_hours = self.get_cookie_age(st)
+
         if age_hours >= self.max_age_hours:
             logger.info(f"🔄 Cookies are {age_hours:.1f} hours old (max: {self.max_age_hours}h), forcing refresh")
-            return True
-        
-        return False
+            return True, age_hours
+
+        return False, age_hours
     
-    def refresh_cookies(self):
-        """Export fresh cookies from Firefox."""
+    def _do_refresh(self):
+        """Export fresh cookies from Firefox; runs on the refresh thread."""
         try:
             logger.info("🔄 Refreshing cookies from Firefox...")
             start_time = datetime.now()
-            
+
             export_firefox_cookies()
-            
+
             duration = datetime.now() - start_time
-            file_size = os.path.getsize(self.cookies_file) if os.path.exists(self.cookies_file) else 0
-            
+            st = self._stat_cookies()
+            file_size = st.st_size if st else 0
+
             logger.info(f"✅ Cookies refreshed successfully in {duration.total_seconds():.2f}s")
             logger.info(f"📄 Cookie file size: {file_size} bytes")
-            
-            return True
-            
+
+            self._refresh_success = True
+
         except Exception as e:
             logger.error(f"❌ Failed to refresh cookies: {e}")
-            return False
+            self._refresh_success = False
+        finally:
+            self._refresh_done.set()
+
+    def refresh_cookies(self, wait=False):
+        """Kick off a cookie refresh on a daemon thread.
+
+        Reading and decrypting the Firefox profile can take seconds, so the
+        monitor loop keeps running while the refresh happens. One-shot CLI
+        modes pass wait=True to block until completion and get the real
+        success status.
+        """
+        if not (self._refresh_thread and self._refresh_thread.is_alive()):
+            self._refresh_done.clear()
+            self._refresh_thread = threading.Thread(target=self._do_refresh, daemon=True)
+            self._refresh_thread.start()
+
+        if wait:
+            self._refresh_thread.join()
+            return self._refresh_success
+        return True
     
-    def run_once(self):
+    def run_once(self, wait=False):
         """Run one iteration of cookie refresh check."""
         logger.info("🔍 Checking cookie status...")
-        
-        if self.should_refresh_cookies():
-            return self.refresh_cookies()
+
+        needs_refresh, age_hours = self.should_refresh_cookies()
+        if needs_refresh:
+            return self.refresh_cookies(wait=wait)
         else:
-            age_hours = self.get_cookie_age()
             logger.info(f"✅ Cookies are fresh ({age_hours:.1f}h old, max: {self.max_age_hours}h)")
             return True
     
@@ -105,10 +166,11 @@ class CookieMonitor:
                 if not success:
                     logger.warning("⚠️ Cookie refresh failed, will retry on next cycle")
                 
-                # Wait for next interval
+                # Wait for next interval; returns early if stop() is called
                 logger.info(f"⏳ Waiting {self.interval_minutes} minutes until next check...")
-                time.sleep(self.interval_minutes * 60)
-                
+                if self._stop_event.wait(self.interval_minutes * 60):
+                    break
+
             except KeyboardInterrupt:
                 logger.info("🛑 Cookie monitor stopped by user")
                 self.running = False
@@ -116,7 +178,8 @@ class CookieMonitor:
             except Exception as e:
                 logger.error(f"❌ Unexpected error in cookie monitor: {e}")
                 logger.info("⏳ Waiting 5 minutes before retry...")
-                time.sleep(300)  # Wait 5 minutes before retrying
+                if self._stop_event.wait(300):  # Wait 5 minutes before retrying
+                    break
         
         logger.info("🏁 Cookie monitor stopped")
 
@@ -138,10 +201,13 @@ def main():
         interval_minutes=args.interval,
         max_age_hours=args.max_age
     )
-    
+
+    # Let SIGTERM unblock the interval wait for a clean shutdown
+    signal.signal(signal.SIGTERM, lambda *_: monitor.stop())
+
     if args.force:
         logger.info("🔄 Force refreshing cookies...")
-        success = monitor.refresh_cookies()
+        success = monitor.refresh_cookies(wait=True)
         if success:
             logger.info("✅ Force refresh completed successfully")
         else:
@@ -150,7 +216,7 @@ def main():
     
     if args.once:
         logger.info("🔄 Running single cookie check...")
-        success = monitor.run_once()
+        success = monitor.run_once(wait=True)
         if success:
             logger.info("✅ Single check completed successfully")
         else:
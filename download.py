@@ -9,36 +9,108 @@ import yt_dlp
 import os
 import concurrent.futures
 import logging
+import logging.handlers
+import queue
+import atexit
+import hashlib
+import itertools
+import json
+import re
+import subprocess
+import time
 from datetime import datetime
 import csv
 from google.cloud import storage
+from google.cloud.storage import transfer_manager
 import google.api_core.retry
 import google.api_core.client_options
 import threading
-from pathlib import Path
+from pathlib import Path, PurePosixPath
 
 # Configuration
+# Compiled once so per-line validation is a single C-level match
+_VALID_CHANNEL = re.compile(r'^https?://(?:www\.)?youtube\.com/')
+
+# Matches auth-related failures in one pass instead of a substring scan per
+# keyword; case-insensitive so callers don't need to lower() the message
+_AUTH_ERR_RE = re.compile(
+    r'authentication|login|cookie|expired|password|username|credentials|sign in',
+    re.IGNORECASE,
+)
+
 def get_channel_urls():
+    """Read channel URLs from the manifest, validated once up front.
+
+    Blank lines, comments and anything that is not a YouTube URL are
+    dropped here so downstream code never has to re-check entries.
+    """
     with open('/tmp/manifest.txt', 'r') as f:
-        return [line.strip() for line in f.readlines()]
+        return [line for line in (raw.strip() for raw in f)
+                if line and not line.startswith('#') and _VALID_CHANNEL.match(line)]
 
 CHANNEL_URLS = get_channel_urls()
 
 DOWNLOAD_DIRECTORY = "podcasts"
-MAX_WORKERS = 4
+MAX_WORKERS = 4          # starting download concurrency
+MAX_CONCURRENCY = 16     # ceiling the adaptive controller may grow to
+
+# Upload concurrency is sized to the uplink, not to the download pool;
+# override per host when the link can take more parallel streams
+UPLOAD_WORKERS = int(os.environ.get('UPLOAD_WORKERS', '4'))
+
+# Exported Netscape cookie jar shared by all yt-dlp calls. Reading this file
+# is far cheaper than cookiesfrombrowser, which re-decrypts the Firefox
+# SQLite DB on every YoutubeDL construction.
+COOKIES_FILE = 'cookies.txt'
+COOKIES_MAX_AGE_SECONDS = 24 * 3600
 
 # GCS Configuration
 GCS_BUCKET_NAME = "multichannel-podcasts"
 GCS_PREFIX = "raw_audio"
 
+# Target codec for stored audio. WAV stays the default so existing buckets
+# keep their layout, but Opus at 32 kbps is 10-30x smaller and adequate for
+# downstream speech use — set AUDIO_FORMAT=opus (or flac for lossless) to
+# cut upload time and storage proportionally.
+_AUDIO_FORMATS = {
+    'wav': ('.wav', 'audio/wav', ['-f', 'wav']),
+    'opus': ('.opus', 'audio/opus', ['-c:a', 'libopus', '-b:a', '32k', '-f', 'opus']),
+    'flac': ('.flac', 'audio/flac', ['-c:a', 'flac', '-f', 'flac']),
+}
+AUDIO_FORMAT = os.environ.get('AUDIO_FORMAT', 'wav')
+AUDIO_SUFFIX, _AUDIO_CONTENT_TYPE, _FFMPEG_ENCODE_ARGS = _AUDIO_FORMATS[AUDIO_FORMAT]
+
+# Shared retry policies, built once instead of per call
+_RETRY_PREDICATE = google.api_core.retry.if_exception_type(
+    google.api_core.exceptions.DeadlineExceeded,
+    google.api_core.exceptions.ServiceUnavailable,
+    google.api_core.exceptions.TooManyRequests,
+)
+_RETRY_EXISTS = google.api_core.retry.Retry(
+    initial=1.0, maximum=30.0, multiplier=2, predicate=_RETRY_PREDICATE
+)
+_RETRY_UPLOAD = google.api_core.retry.Retry(
+    initial=1.0, maximum=60.0, multiplier=2, predicate=_RETRY_PREDICATE
+)
+
 # Setup logging
+# Worker threads only enqueue log records; a single QueueListener thread owns
+# the file/stream handlers so workers never block on disk I/O for logging.
+_log_queue = queue.Queue(-1)
+_log_formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
+_file_handler = logging.FileHandler('download.log')
+_file_handler.setFormatter(_log_formatter)
+_stream_handler = logging.StreamHandler()
+_stream_handler.setFormatter(_log_formatter)
+_log_listener = logging.handlers.QueueListener(
+    _log_queue, _file_handler, _stream_handler, respect_handler_level=True
+)
+_log_listener.start()
+atexit.register(_log_listener.stop)
+
 logging.basicConfig(
     level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('download.log'),
-        logging.StreamHandler()
-    ]
+    handlers=[logging.handlers.QueueHandler(_log_queue)]
 )
 logger = logging.getLogger(__name__)
 
@@ -46,38 +118,248 @@ logger = logging.getLogger(__name__)
 CSV_FILE = 'download_status.csv'
 CSV_HEADERS = ['timestamp', 'url', 'filename', 'status', 'duration_seconds', 'error_message']
 
+# Rows are enqueued by workers and written by a single background thread that
+# keeps one file handle open, so the hot path never pays for open/flush per row.
+# The thread starts on the first row, not at import, so modules that only
+# borrow a function from here (e.g. cookie_monitor) don't spawn it or touch
+# the CSV file as a side effect.
+_csv_queue = queue.Queue()
+_CSV_FLUSH_BATCH = 64
+_csv_thread = None
+_csv_thread_lock = threading.Lock()
+
+def _csv_writer_loop():
+    """Drain queued CSV rows into a single long-lived writer."""
+    try:
+        write_header = os.stat(CSV_FILE).st_size == 0
+    except OSError:
+        write_header = True
+    with open(CSV_FILE, 'a', newline='', encoding='utf-8') as csvfile:
+        writer = csv.writer(csvfile)
+        if write_header:
+            writer.writerow(CSV_HEADERS)
+        pending = 0
+        while True:
+            row = _csv_queue.get()
+            if row is None:
+                csvfile.flush()
+                _csv_queue.task_done()
+                return
+            # Timestamp on dequeue: time.strftime is C-level and runs on the
+            # writer thread, not in the worker that produced the row
+            writer.writerow([time.strftime('%Y-%m-%d %H:%M:%S')] + row)
+            pending += 1
+            if pending >= _CSV_FLUSH_BATCH or _csv_queue.qsize() == 0:
+                csvfile.flush()
+                pending = 0
+            _csv_queue.task_done()
+
+def _drain_csv_queue():
+    """Flush any queued rows before the process exits."""
+    _csv_queue.put(None)
+    _csv_thread.join(timeout=10)
+
+def _ensure_csv_thread():
+    """Start the CSV writer thread on first use."""
+    global _csv_thread
+    with _csv_thread_lock:
+        if _csv_thread is None:
+            _csv_thread = threading.Thread(target=_csv_writer_loop, daemon=True)
+            _csv_thread.start()
+            atexit.register(_drain_csv_queue)
+
+# Deleting a finished file can block on network/SSD filesystems, so workers
+# hand paths to one background thread and move straight to the next video.
+# Like the CSV writer, the thread starts on the first deletion, not at import.
+_delete_queue = queue.SimpleQueue()
+_delete_thread = None
+_delete_thread_lock = threading.Lock()
+
+def _deleter_loop():
+    """Unlink queued paths; None is the shutdown sentinel."""
+    while True:
+        path = _delete_queue.get()
+        if path is None:
+            return
+        try:
+            os.unlink(path)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("🗑️ Deleted local file: %s", path)
+        except OSError as e:
+            logger.warning("⚠️ Could not delete %s: %s", path, e)
+
+def _drain_delete_queue():
+    """Finish pending deletions before the process exits."""
+    _delete_queue.put(None)
+    _delete_thread.join(timeout=10)
+
+def _queue_delete(path):
+    """Hand a path to the background deleter, starting it on first use."""
+    global _delete_thread
+    with _delete_thread_lock:
+        if _delete_thread is None:
+            _delete_thread = threading.Thread(target=_deleter_loop, daemon=True)
+            _delete_thread.start()
+            atexit.register(_drain_delete_queue)
+    _delete_queue.put(path)
+
 class DownloadCounters:
-    """Thread-safe counters for download statistics."""
+    """Thread-safe counters for download statistics.
+
+    Each counter is an itertools.count: next() is a single C call, so
+    increments are atomic under the GIL without serializing workers on a
+    shared mutex. Reads recover the current value from the iterator state.
+    """
     def __init__(self):
-        self.downloaded = 0
-        self.uploaded = 0
-        self.failed = 0
-        self.lock = threading.Lock()
+        self._downloaded = itertools.count()
+        self._uploaded = itertools.count()
+        self._failed = itertools.count()
+
+    @staticmethod
+    def _value(counter):
+        return counter.__reduce__()[1][0]
+
+    @property
+    def downloaded(self):
+        return self._value(self._downloaded)
+
+    @property
+    def uploaded(self):
+        return self._value(self._uploaded)
+
+    @property
+    def failed(self):
+        return self._value(self._failed)
 
     def increment_downloaded(self):
-        with self.lock:
-            self.downloaded += 1
+        next(self._downloaded)
 
     def increment_uploaded(self):
-        with self.lock:
-            self.uploaded += 1
+        next(self._uploaded)
 
     def increment_failed(self):
-        with self.lock:
-            self.failed += 1
+        next(self._failed)
+
+class AdaptiveLimiter:
+    """AIMD-style controller for download concurrency.
+
+    Workers hold a permit for the duration of one video. A monitor thread
+    compares throughput between windows: it grants one more permit while
+    throughput keeps climbing and errors stay rare, and withdraws one when
+    errors spike or throughput drops, tracking whatever rate YouTube is
+    actually willing to serve instead of a hardcoded worker count.
+    """
+
+    def __init__(self, initial, minimum=1, maximum=MAX_CONCURRENCY, interval_seconds=30.0):
+        self.minimum = minimum
+        self.maximum = maximum
+        self._limit = initial
+        self._semaphore = threading.Semaphore(initial)
+        self._lock = threading.Lock()
+        self._bytes = 0
+        self._completed = 0
+        self._errors = 0
+        self._last_throughput = 0.0
+        self._stop_event = threading.Event()
+        self._monitor = threading.Thread(
+            target=self._adjust_loop, args=(interval_seconds,), daemon=True
+        )
+        self._monitor.start()
+
+    def acquire(self):
+        self._semaphore.acquire()
+
+    def release(self):
+        self._semaphore.release()
+
+    def record_bytes(self, nbytes):
+        with self._lock:
+            self._bytes += nbytes
+
+    def record_result(self, error=False):
+        with self._lock:
+            self._completed += 1
+            if error:
+                self._errors += 1
+
+    def _adjust_loop(self, interval_seconds):
+        while not self._stop_event.wait(interval_seconds):
+            with self._lock:
+                nbytes, completed, errors = self._bytes, self._completed, self._errors
+                self._bytes = self._completed = self._errors = 0
+
+            if completed == 0:
+                continue
+
+            throughput = nbytes / interval_seconds
+            error_rate = errors / completed
+
+            if error_rate > 0.01 or (self._last_throughput and throughput < self._last_throughput * 0.9):
+                # Back off: withdraw a permit once a worker frees one
+                if self._limit > self.minimum and self._semaphore.acquire(timeout=1):
+                    self._limit -= 1
+                    logger.info(f"📉 Download concurrency lowered to {self._limit}")
+            elif self._limit < self.maximum and throughput > self._last_throughput * 1.05:
+                self._limit += 1
+                self._semaphore.release()
+                logger.info(f"📈 Download concurrency raised to {self._limit}")
+
+            self._last_throughput = throughput
+
+# Built on first use rather than at import: constructing the limiter spawns
+# its monitor thread, which importers of this module don't need.
+_download_limiter = None
+_limiter_lock = threading.Lock()
+
+def _get_download_limiter():
+    """Return the process-wide limiter, building it on first use."""
+    global _download_limiter
+    with _limiter_lock:
+        if _download_limiter is None:
+            _download_limiter = AdaptiveLimiter(initial=MAX_WORKERS)
+    return _download_limiter
 
 def write_csv_entry(url, filename, status, duration_seconds, error_message=""):
-    """Writes a download status entry to the CSV file."""
-    timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-    row = [timestamp, url, filename, status, duration_seconds, error_message]
-    
-    file_exists = os.path.exists(CSV_FILE)
-    
-    with open(CSV_FILE, 'a', newline='', encoding='utf-8') as csvfile:
-        writer = csv.writer(csvfile)
-        if not file_exists:
-            writer.writerow(CSV_HEADERS)
-        writer.writerow(row)
+    """Queues a download status entry for the background CSV writer."""
+    _ensure_csv_thread()
+    _csv_queue.put([url, filename, status, duration_seconds, error_message])
+
+def export_firefox_cookies(cookies_file=COOKIES_FILE):
+    """Decrypt the Firefox cookie DB once and export it as a cookies.txt file."""
+    logger.info("🍪 Exporting Firefox cookies to %s", cookies_file)
+    with yt_dlp.YoutubeDL({'cookiesfrombrowser': ('firefox',), 'quiet': True}) as ydl:
+        ydl.cookiejar.save(cookies_file, ignore_discard=True, ignore_expires=True)
+
+# Under a burst of auth failures every retrying thread would otherwise
+# re-decrypt the Firefox cookie DB; one refresh per minute process-wide is
+# plenty, and threads arriving during a refresh wait on the lock and reuse it.
+_cookie_lock = threading.Lock()
+_last_cookie_refresh = 0.0
+
+def refresh_cookies_throttled():
+    """Re-export cookies at most once per 60s across all threads."""
+    global _last_cookie_refresh
+    with _cookie_lock:
+        if time.time() - _last_cookie_refresh < 60:
+            return
+        try:
+            export_firefox_cookies()
+            _last_cookie_refresh = time.time()
+        except Exception as e:
+            logger.error(f"❌ Failed to export Firefox cookies: {e}")
+
+def ensure_fresh_cookies():
+    """Export cookies at startup when the shared cookie file is missing or stale."""
+    try:
+        age = time.time() - os.path.getmtime(COOKIES_FILE)
+    except OSError:
+        age = float('inf')
+
+    if age > COOKIES_MAX_AGE_SECONDS:
+        try:
+            export_firefox_cookies()
+        except Exception as e:
+            logger.error(f"❌ Failed to export Firefox cookies: {e}")
 
 def initialize_gcs_client():
     """Initialize Google Cloud Storage client with timeout configuration."""
@@ -94,101 +376,336 @@ def initialize_gcs_client():
         logger.error(f"❌ Failed to connect to GCS: {e}")
         return None, None
 
+# Cache of blob names known to exist on GCS. Both the pre-download check and
+# the pre-upload check ask about the same blob name, so a hit here saves a
+# full GCS HEAD round-trip (with its retry/timeout budget) per video.
+_exists_cache = set()
+_exists_cache_lock = threading.Lock()
+
+# Set once a full listing has primed the cache; from then on a cache miss
+# means the blob really is absent and no per-blob HEAD is needed.
+_exists_cache_primed = False
+
+def _mark_blob_exists(blob_name):
+    """Record a blob as present so later checks skip the network."""
+    with _exists_cache_lock:
+        _exists_cache.add(blob_name)
+
+def _blob_known_to_exist(blob_name):
+    """Cache-only existence check; never touches the network."""
+    with _exists_cache_lock:
+        return blob_name in _exists_cache
+
+def _candidate_blob_name(uploader, title):
+    """Predict the blob name a video will upload to from flat-playlist metadata.
+
+    Mirrors the '%(uploader)s/%(title)s' outtmpl plus the configured audio
+    suffix. Returns None when the flat extraction didn't yield both fields;
+    a mismatch only means the cheap pre-skip doesn't fire for that video.
+    """
+    if not uploader or not title:
+        return None
+    safe_uploader = yt_dlp.utils.sanitize_filename(uploader)
+    safe_title = yt_dlp.utils.sanitize_filename(title)
+    return f"{GCS_PREFIX}/{safe_uploader}/{safe_title}{AUDIO_SUFFIX}"
+
+def prefetch_existing_blobs(bucket, prefix):
+    """Prime the existence cache with one paginated LIST of the prefix.
+
+    A single LIST returns 1000 names per page, replacing one HEAD per video
+    with an O(1) set lookup for the whole run.
+    """
+    global _exists_cache_primed
+    if not bucket or _exists_cache_primed:
+        return
+
+    try:
+        # Only the names are needed, so ask for nothing but names per page
+        names = {blob.name for blob in bucket.list_blobs(
+            prefix=f"{prefix}/", fields="items(name),nextPageToken",
+            timeout=120, retry=_RETRY_EXISTS)}
+    except Exception as e:
+        logger.warning("⚠️ Could not prefetch existing blobs under %s/: %s", prefix, e)
+        return
+
+    with _exists_cache_lock:
+        _exists_cache.update(names)
+    _exists_cache_primed = True
+    logger.info(f"📦 Prefetched {len(names)} existing blobs under {prefix}/")
+
+# Names with a HEAD currently on the wire; concurrent callers for the same
+# name wait for that result instead of issuing duplicate RPCs.
+_exists_inflight = {}
+
 def blob_exists(bucket, blob_name):
     """Check if a blob already exists in the bucket with timeout configuration."""
     if not bucket:
         return False
-        
+
+    with _exists_cache_lock:
+        if blob_name in _exists_cache:
+            return True
+        if _exists_cache_primed:
+            return False
+        pending = _exists_inflight.get(blob_name)
+        if pending is None:
+            _exists_inflight[blob_name] = pending = threading.Event()
+            owns_lookup = True
+        else:
+            owns_lookup = False
+
+    if not owns_lookup:
+        pending.wait(timeout=60)
+        return _blob_known_to_exist(blob_name)
+
     blob = bucket.blob(blob_name)
-    
-    retry_config = google.api_core.retry.Retry(
-        initial=1.0,
-        maximum=30.0,
-        multiplier=2,
-        predicate=google.api_core.retry.if_exception_type(
-            google.api_core.exceptions.DeadlineExceeded,
-            google.api_core.exceptions.ServiceUnavailable,
-            google.api_core.exceptions.TooManyRequests,
-        ),
-    )
-    
+
     try:
-        return blob.exists(timeout=60, retry=retry_config)
+        exists = blob.exists(timeout=60, retry=_RETRY_EXISTS)
+        if exists:
+            _mark_blob_exists(blob_name)
+        return exists
     except Exception as e:
-        logger.warning(f"⚠️ Error checking if blob exists {blob_name}: {e}")
+        logger.warning("⚠️ Error checking if blob exists %s: %s", blob_name, e)
         return False
+    finally:
+        with _exists_cache_lock:
+            del _exists_inflight[blob_name]
+        pending.set()
+
+# Resumable-upload chunk size for single-stream uploads (file and streaming)
+_UPLOAD_CHUNK_SIZE = 8 * 1024 * 1024
+
+# Files at least this large are uploaded as concurrent chunks; a single TCP
+# flow rarely saturates the uplink for hour-long WAVs
+_CHUNKED_UPLOAD_THRESHOLD = 32 * 1024 * 1024
+_CHUNKED_UPLOAD_CHUNK_SIZE = 32 * 1024 * 1024
+_CHUNKED_UPLOAD_WORKERS = 4
 
-def upload_audio_to_gcs(bucket, audio_file, relative_path):
+def upload_audio_to_gcs(bucket, audio_file, blob_name):
     """Upload an audio file to GCS with timeout and retry configuration."""
     if not bucket:
         return False
-        
+
     try:
-        blob_name = f"{GCS_PREFIX}/{relative_path}"
-        
-        if blob_exists(bucket, blob_name):
-            logger.info(f"⏭️ Skipped (already exists): {audio_file} -> gs://{GCS_BUCKET_NAME}/{blob_name}")
-            return True
-        
         blob = bucket.blob(blob_name)
-        
-        retry_config = google.api_core.retry.Retry(
-            initial=1.0,
-            maximum=60.0,
-            multiplier=2,
-            predicate=google.api_core.retry.if_exception_type(
-                google.api_core.exceptions.DeadlineExceeded,
-                google.api_core.exceptions.ServiceUnavailable,
-                google.api_core.exceptions.TooManyRequests,
-            ),
-        )
-        
+
+        if os.path.getsize(audio_file) >= _CHUNKED_UPLOAD_THRESHOLD:
+            # Chunked XML multipart uploads don't support generation
+            # preconditions, so keep the existence check here — a set lookup
+            # once the prefetch has primed the cache
+            if blob_exists(bucket, blob_name):
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("⏭️ Skipped (already exists): %s -> gs://%s/%s",
+                                 audio_file, GCS_BUCKET_NAME, blob_name)
+                return True
+
+            # worker_type="thread": the default forks a process pool per
+            # call, and forking this heavily multithreaded process (download
+            # workers, QueueListener) can inherit held logging/SSL locks in
+            # the children and hang; the chunks are network-bound, so threads
+            # overlap just as well without the fork hazard or per-file
+            # pool-spawn cost
+            transfer_manager.upload_chunks_concurrently(
+                audio_file,
+                blob,
+                chunk_size=_CHUNKED_UPLOAD_CHUNK_SIZE,
+                max_workers=_CHUNKED_UPLOAD_WORKERS,
+                deadline=600,
+                worker_type=transfer_manager.THREAD,
+            )
+            _mark_blob_exists(blob_name)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("☁️ Uploaded (chunked): %s -> gs://%s/%s",
+                             audio_file, GCS_BUCKET_NAME, blob_name)
+            return True
+
+        # 8 MiB resumable chunks instead of the library's 100 MiB default:
+        # smaller chunks pipeline better and fail/retry in smaller units
+        blob.chunk_size = _UPLOAD_CHUNK_SIZE
+
+        # if_generation_match=0 makes GCS reject the upload atomically when
+        # the object already exists, replacing a separate HEAD round-trip;
+        # checksum=None skips the client-side MD5 pass over the whole file.
         blob.upload_from_filename(
             audio_file,
             timeout=300,
-            retry=retry_config
+            retry=_RETRY_UPLOAD,
+            checksum=None,
+            if_generation_match=0
         )
-        
-        logger.info(f"☁️ Uploaded: {audio_file} -> gs://{GCS_BUCKET_NAME}/{blob_name}")
+        _mark_blob_exists(blob_name)
+
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("☁️ Uploaded: %s -> gs://%s/%s",
+                         audio_file, GCS_BUCKET_NAME, blob_name)
         return True
-        
+
+    except google.api_core.exceptions.PreconditionFailed:
+        _mark_blob_exists(blob_name)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("⏭️ Skipped (already exists): %s -> gs://%s/%s",
+                         audio_file, GCS_BUCKET_NAME, blob_name)
+        return True
+
     except Exception as e:
-        logger.error(f"❌ Failed to upload {audio_file}: {e}")
+        logger.error("❌ Failed to upload %s: %s", audio_file, e)
         return False
 
+def stream_audio_to_gcs(bucket, audio_file, blob_name):
+    """Transcode a downloaded file and stream it to GCS without landing on disk.
+
+    WAV is ~10 MB/min, so writing it locally and re-reading it for upload
+    costs a full file of disk bandwidth per episode. Instead ffmpeg encodes
+    to the configured AUDIO_FORMAT and its stdout feeds a GCS resumable
+    upload directly (size=None streams as bytes arrive).
+    """
+    if not bucket:
+        return False
+
+    blob = bucket.blob(blob_name)
+    # Size-unknown streams buffer one chunk in memory before each send, so
+    # the 100 MiB library default would hold that much PCM per upload worker
+    blob.chunk_size = _UPLOAD_CHUNK_SIZE
+
+    proc = subprocess.Popen(
+        ['ffmpeg', '-v', 'error', '-i', audio_file] + _FFMPEG_ENCODE_ARGS + ['pipe:1'],
+        stdout=subprocess.PIPE,
+    )
+    try:
+        blob.upload_from_file(
+            proc.stdout,
+            content_type=_AUDIO_CONTENT_TYPE,
+            size=None,
+            timeout=600,
+            checksum=None,
+            if_generation_match=0,
+        )
+        returncode = proc.wait()
+        if returncode != 0:
+            # The upload finalized when ffmpeg's stdout hit EOF, so a
+            # truncated object now exists on GCS; delete it, or every later
+            # run's existence check would treat this video as done and the
+            # corrupt audio would persist forever
+            logger.error("❌ ffmpeg exited with %d while streaming %s", returncode, audio_file)
+            try:
+                blob.delete(if_generation_match=blob.generation, timeout=60,
+                            retry=_RETRY_EXISTS)
+            except Exception as e:
+                logger.warning("⚠️ Could not delete truncated blob %s: %s", blob_name, e)
+            return False
+        _mark_blob_exists(blob_name)
+
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("☁️ Streamed: %s -> gs://%s/%s",
+                         audio_file, GCS_BUCKET_NAME, blob_name)
+        return True
+
+    except google.api_core.exceptions.PreconditionFailed:
+        _mark_blob_exists(blob_name)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("⏭️ Skipped (already exists): %s -> gs://%s/%s",
+                         audio_file, GCS_BUCKET_NAME, blob_name)
+        return True
+
+    except Exception as e:
+        logger.error("❌ Failed to stream %s: %s", audio_file, e)
+        return False
+
+    finally:
+        if proc.poll() is None:
+            proc.kill()
+            proc.wait()
+
+# Playlist listings change slowly, so cache them on disk and reuse within
+# the TTL; a fresh run then costs one stat instead of minutes of pagination.
+PLAYLIST_CACHE_DIR = '.playlist_cache'
+PLAYLIST_CACHE_TTL_SECONDS = 6 * 3600
+
+def _playlist_cache_path(channel_url):
+    """Cache file path for a channel's video URL listing."""
+    digest = hashlib.sha1(channel_url.encode()).hexdigest()
+    return os.path.join(PLAYLIST_CACHE_DIR, f"{digest}.json")
+
+def _parse_flat_entry(line):
+    """Parse one url<TAB>uploader<TAB>title line from yt-dlp's --print output."""
+    parts = line.split('\t', 2)
+    entry = {'url': parts[0]}
+    if len(parts) == 3:
+        # yt-dlp prints NA for fields the flat extraction didn't yield
+        entry['uploader'] = parts[1] if parts[1] != 'NA' else None
+        entry['title'] = parts[2] if parts[2] != 'NA' else None
+    return entry
+
 def get_video_urls(channel_url):
-    """Extract all video URLs from a YouTube channel playlist using cookies-from-browser."""
+    """Extract all video entries (url/uploader/title) from a YouTube channel playlist."""
+    cache_path = _playlist_cache_path(channel_url)
+    try:
+        if time.time() - os.path.getmtime(cache_path) < PLAYLIST_CACHE_TTL_SECONDS:
+            with open(cache_path, 'r', encoding='utf-8') as f:
+                entries = json.load(f)
+            if entries and not isinstance(entries[0], dict):
+                raise ValueError('legacy cache format')
+            logger.info(f"📂 Using cached video list for {channel_url} ({len(entries)} videos)")
+            return entries
+    except (OSError, ValueError):
+        pass  # no cache, stale cache, or unreadable cache — fetch fresh
+
     logger.info(f"🔍 Fetching video list from: {channel_url}")
-    start_time = datetime.now()
-    
-    ydl_opts = {
-        'cookiesfrombrowser': ('firefox',),  # Use Firefox cookies
-        'extract_flat': 'in_playlist',
-        'quiet': True,
-    }
-    
+    start_time = time.monotonic()
+
+    # Run yt-dlp as a subprocess and read entries off its stdout as pages
+    # arrive, instead of materializing every entry as an info dict in-process.
+    # uploader/title let the channel loop pre-skip videos already on GCS.
+    cmd = [
+        'yt-dlp', '--flat-playlist', '--print', '%(url)s\t%(uploader)s\t%(title)s',
+        '--cookies', COOKIES_FILE, '--no-warnings', channel_url,
+    ]
+
     max_retries = 3
     for attempt in range(max_retries):
         try:
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                info_dict = ydl.extract_info(channel_url, download=False)
-                if 'entries' in info_dict:
-                    urls = [entry['url'] for entry in info_dict['entries'] if entry]
-                    duration = datetime.now() - start_time
-                    logger.info(f"✅ Found {len(urls)} videos from {channel_url} in {duration.total_seconds():.2f}s")
-                    return urls
-                else:
+            proc = subprocess.Popen(
+                cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True
+            )
+            # Drain stderr on a helper thread while this thread reads stdout:
+            # yt-dlp can emit more than a pipe buffer of per-entry ERROR lines
+            # (--no-warnings doesn't suppress errors), and with both streams
+            # piped the child would block on stderr while we block on stdout
+            stderr_chunks = []
+            stderr_thread = threading.Thread(
+                target=lambda: stderr_chunks.append(proc.stderr.read()), daemon=True
+            )
+            stderr_thread.start()
+            entries = [_parse_flat_entry(line.strip()) for line in proc.stdout if line.strip()]
+            proc.wait()
+            stderr_thread.join(timeout=10)
+            stderr = stderr_chunks[0] if stderr_chunks else ''
+
+            if proc.returncode == 0:
+                if not entries:
                     logger.warning(f"⚠️ No video entries found for {channel_url}")
                     return []
-                    
+                duration = time.monotonic() - start_time
+                logger.info(f"✅ Found {len(entries)} videos from {channel_url} in {duration:.2f}s")
+                try:
+                    os.makedirs(PLAYLIST_CACHE_DIR, exist_ok=True)
+                    with open(cache_path, 'w', encoding='utf-8') as f:
+                        json.dump(entries, f)
+                except OSError as e:
+                    logger.warning("⚠️ Could not write playlist cache for %s: %s", channel_url, e)
+                return entries
+
+            detail = stderr.strip().splitlines()[-1] if stderr.strip() else ''
+            raise RuntimeError(f"yt-dlp exited {proc.returncode}: {detail}")
+
         except Exception as e:
-            error_message = str(e).lower()
-            
             # Check for authentication errors
-            if any(keyword in error_message for keyword in ['authentication', 'login', 'cookie', 'expired']):
+            if _AUTH_ERR_RE.search(str(e)):
                 logger.error(f"❌ Authentication failed for {channel_url}: {e}")
                 if attempt < max_retries - 1:
                     logger.info(f"🔄 Retrying authentication (attempt {attempt + 2}/{max_retries})...")
+                    refresh_cookies_throttled()
                     continue
                 else:
                     logger.error("❌ Max authentication retries reached")
@@ -201,156 +718,307 @@ def get_video_urls(channel_url):
     
     return []
 
+# Dedicated pool for GCS uploads. Download workers hand finished files to it
+# and immediately start the next video, so network-in and network-out overlap
+# instead of serializing inside a single worker thread.
+_upload_pool = concurrent.futures.ThreadPoolExecutor(
+    max_workers=UPLOAD_WORKERS, thread_name_prefix='upload'
+)
+
+# Bound how many finished files may sit on disk waiting for the upload pool.
+# Without this, downloads that outpace the uplink stage unbounded WAVs locally.
+_upload_backlog = threading.BoundedSemaphore(UPLOAD_WORKERS * 2)
+
+def _submit_upload(bucket, audio_file, blob_name):
+    """Queue an upload, blocking the producer when the staging backlog is full."""
+    _upload_backlog.acquire()
+    future = _upload_pool.submit(_upload_and_cleanup, bucket, audio_file, blob_name)
+    future.add_done_callback(lambda _: _upload_backlog.release())
+    return future
+
+def _upload_and_cleanup(bucket, audio_file, blob_name):
+    """Upload a finished download and delete the local copy on success.
+
+    Files already in the target format go through the plain file upload;
+    anything else is transcoded and streamed so the big intermediate stays
+    off disk.
+    """
+    try:
+        if audio_file.endswith(AUDIO_SUFFIX):
+            uploaded = upload_audio_to_gcs(bucket, audio_file, blob_name)
+        else:
+            uploaded = stream_audio_to_gcs(bucket, audio_file, blob_name)
+        if uploaded:
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("☁️ Uploaded to GCS: %s", audio_file)
+            _queue_delete(audio_file)
+            return True
+        logger.warning(f"⚠️ Failed to upload to GCS: {audio_file}")
+        return False
+    except Exception as e:
+        logger.error(f"❌ Error during GCS upload: {e}")
+        return False
+
+# One YoutubeDL per worker thread. Constructing it per video re-parses
+# options, reloads the cookiefile and rebuilds every extractor, so each
+# thread builds one lazily and reuses it for all videos it processes.
+_tls = threading.local()
+
+def _download_finished_hook(d):
+    """Record the file yt-dlp wrote; each thread handles one video at a time."""
+    if d['status'] == 'finished':
+        _tls.final_path = d.get('filename')
+
+def _postprocess_finished_hook(d):
+    """Record the post-ffmpeg path, which supersedes the raw download."""
+    if d['status'] == 'finished':
+        filepath = d.get('info_dict', {}).get('filepath')
+        if filepath:
+            _tls.final_path = filepath
+
+# Option dicts are identical for every video under a given download root,
+# so build them once instead of per call (a benign race at worst builds the
+# same dict twice)
+_ydl_opts_cache = {}
+
+def _ydl_opts_for(download_path):
+    """Return the shared yt-dlp option dict for a download root."""
+    opts = _ydl_opts_cache.get(download_path)
+    if opts is None:
+        opts = {
+            'cookiefile': COOKIES_FILE,
+            'format': 'bestaudio[ext=wav]/bestaudio',
+            # No FFmpegExtractAudio postprocessor: the WAV conversion happens
+            # at upload time, streamed from ffmpeg's stdout straight to GCS,
+            # so the (~10x larger) PCM never touches local disk
+            'ignoreerrors': True,
+            # Fetch DASH fragments in parallel and in 10 MB ranges so one
+            # large video can still fill the pipe; the outer worker count
+            # stays modest to bound aggregate sockets (4 x 4 = 16 streams)
+            'concurrent_fragment_downloads': 4,
+            'http_chunk_size': 10485760,
+            'outtmpl': os.path.join(download_path, '%(uploader)s/%(title)s.%(ext)s'),
+            'prefer_ffmpeg': False,
+            'quiet': True,
+            'progress_hooks': [_download_finished_hook],
+            'postprocessor_hooks': [_postprocess_finished_hook],
+        }
+        _ydl_opts_cache[download_path] = opts
+    return opts
+
+def _get_ydl(ydl_opts):
+    """Return this thread's reusable YoutubeDL instance, creating it on first use."""
+    ydl = getattr(_tls, 'ydl', None)
+    if ydl is None:
+        ydl = yt_dlp.YoutubeDL(ydl_opts)
+        atexit.register(ydl.close)
+        _tls.ydl = ydl
+    return ydl
+
 def download_and_upload_video_audio(video_url, download_path, bucket):
     """Downloads audio from a single video URL and uploads it to GCS."""
-    logger.info(f"🎵 Starting download and upload: {video_url}")
-    start_time = datetime.now()
-
-    ydl_opts = {
-        'cookiesfrombrowser': ('firefox',),
-        'format': 'bestaudio[ext=wav]/bestaudio',
-        'postprocessors': [
-            {
-                'key': 'FFmpegExtractAudio',
-                'preferredcodec': 'wav',
-                'preferredquality': '192',
-            }
-        ],
-        'postprocessor_args': [],
-        'ignoreerrors': True,
-        'outtmpl': os.path.join(download_path, '%(uploader)s/%(title)s.%(ext)s'),
-        'prefer_ffmpeg': False,
-        'quiet': True,
-    }
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("🎵 Starting download and upload: %s", video_url)
+    start_time = time.monotonic()
+
+    ydl_opts = _ydl_opts_for(download_path)
 
     max_retries = 3
     for attempt in range(max_retries):
         try:
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                # First, extract info to get the expected filename
-                info = ydl.extract_info(video_url, download=False)
-                if not info:
-                    logger.error(f"❌ Could not extract info for {video_url}")
-                    return False, False
-                
-                # Construct the expected filename
-                expected_filename = ydl.prepare_filename(info)
-                expected_filename = os.path.splitext(expected_filename)[0] + '.wav'
-                
-                # Check if file already exists on GCS
-                if bucket:
-                    try:
-                        relative_path = os.path.relpath(expected_filename, download_path)
-                        blob_name = f"{GCS_PREFIX}/{relative_path}"
-                        
-                        if blob_exists(bucket, blob_name):
-                            logger.info(f"⏭️ File already exists on GCS: {expected_filename} -> gs://{GCS_BUCKET_NAME}/{blob_name}")
-                            write_csv_entry(video_url, expected_filename, "ALREADY_EXISTS", 0, "File already on GCS")
-                            return True, True  # Skip download, consider as success
-                    except Exception as e:
-                        logger.warning(f"⚠️ Error checking GCS existence: {e}")
-                
-                # Download the video
-                ydl.download([video_url])
-                
-                # Check if the file was actually downloaded
-                if os.path.exists(expected_filename):
-                    duration = datetime.now() - start_time
-                    logger.info(f"✅ Downloaded successfully: {video_url} (took {duration.total_seconds():.2f}s)")
-                    write_csv_entry(video_url, expected_filename, "DOWNLOAD_SUCCESS", duration.total_seconds())
-                    
-                    # Upload to GCS
-                    if bucket:
-                        try:
-                            # Get relative path from download directory
-                            relative_path = os.path.relpath(expected_filename, download_path)
-                            
-                            if upload_audio_to_gcs(bucket, expected_filename, relative_path):
-                                logger.info(f"☁️ Uploaded to GCS: {expected_filename}")
-                                # Delete local file after successful upload
-                                os.remove(expected_filename)
-                                logger.info(f"🗑️ Deleted local file: {expected_filename}")
-                                return True, True  # download success, upload success
-                            else:
-                                logger.warning(f"⚠️ Failed to upload to GCS: {expected_filename}")
-                                return True, False  # download success, upload failed
-                        except Exception as e:
-                            logger.error(f"❌ Error during GCS upload: {e}")
-                            return True, False  # download success, upload failed
-                    else:
-                        logger.warning(f"⚠️ No GCS bucket available, keeping local file: {expected_filename}")
-                        return True, False  # download success, no upload
-                else:
-                    logger.error(f"❌ Downloaded file not found: {expected_filename}")
-                    return False, False  # download failed
+            ydl = _get_ydl(ydl_opts)
+            # First, extract info to get the expected filename
+            info = ydl.extract_info(video_url, download=False)
+            if not info:
+                logger.error(f"❌ Could not extract info for {video_url}")
+                return False, False
+            
+            # Construct the expected filename (native container extension;
+            # the blob on GCS carries .wav because the upload stage decodes)
+            expected_filename = ydl.prepare_filename(info)
+
+            # Check if file already exists on GCS
+            if bucket:
+                try:
+                    # relative_to is plain string slicing (no abspath
+                    # normalization like os.path.relpath) and keeps POSIX
+                    # separators, which is what GCS blob names need anyway
+                    relative_path = PurePosixPath(expected_filename).relative_to(download_path)
+                    blob_name = f"{GCS_PREFIX}/{relative_path.with_suffix(AUDIO_SUFFIX)}"
                     
-        except Exception as e:
-            error_message = str(e).lower()
+                    if blob_exists(bucket, blob_name):
+                        if logger.isEnabledFor(logging.DEBUG):
+                            logger.debug("⏭️ File already exists on GCS: %s -> gs://%s/%s",
+                                         expected_filename, GCS_BUCKET_NAME, blob_name)
+                        write_csv_entry(video_url, expected_filename, "ALREADY_EXISTS", 0, "File already on GCS")
+                        return True, True  # Skip download, consider as success
+                except Exception as e:
+                    logger.warning(f"⚠️ Error checking GCS existence: {e}")
             
+            # Download the video, reusing the info dict already fetched above
+            # instead of letting ydl.download() re-extract it from YouTube
+            _tls.final_path = None
+            ydl.process_ie_result(info, download=True)
+
+            # The hooks report the path yt-dlp actually wrote, which is more
+            # reliable than the reconstructed name (and needs no stat); only
+            # fall back to stat'ing expected_filename when no hook fired
+            actual_filename = getattr(_tls, 'final_path', None)
+            if actual_filename is None and os.path.exists(expected_filename):
+                actual_filename = expected_filename
+
+            if actual_filename:
+                duration = time.monotonic() - start_time
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("✅ Downloaded successfully: %s (took %.2fs)",
+                                 video_url, duration)
+                write_csv_entry(video_url, actual_filename, "DOWNLOAD_SUCCESS", duration)
+                _get_download_limiter().record_bytes(os.path.getsize(actual_filename))
+
+                # Hand the finished file to the upload pool so this thread
+                # can start the next download while the bytes stream out
+                if bucket:
+                    # Computed once here; every stage below receives the
+                    # finished blob name instead of re-deriving it
+                    blob_name = (f"{GCS_PREFIX}/"
+                                 f"{PurePosixPath(actual_filename).relative_to(download_path).with_suffix(AUDIO_SUFFIX)}")
+                    upload_future = _submit_upload(bucket, actual_filename, blob_name)
+                    return True, upload_future  # download success, upload pending
+                else:
+                    logger.warning(f"⚠️ No GCS bucket available, keeping local file: {actual_filename}")
+                    return True, False  # download success, no upload
+            else:
+                logger.error(f"❌ Downloaded file not found: {expected_filename}")
+                return False, False  # download failed
+                
+        except (yt_dlp.utils.DownloadError, yt_dlp.utils.ExtractorError) as e:
+            # yt-dlp keeps the short extractor message on .msg; checking it
+            # avoids stringifying and scanning the full wrapped traceback
+            error_message = getattr(e, 'msg', None) or str(e)
+
             # Check for authentication errors
-            if any(keyword in error_message for keyword in ['authentication', 'login', 'password', 'username', 'credentials']):
+            if _AUTH_ERR_RE.search(error_message):
                 logger.error(f"❌ Authentication failed for {video_url}: {e}")
                 if attempt < max_retries - 1:
                     logger.info(f"🔄 Retrying authentication (attempt {attempt + 2}/{max_retries})...")
+                    refresh_cookies_throttled()
                     continue
                 else:
                     logger.error("❌ Max authentication retries reached")
-                    duration = datetime.now() - start_time
-                    write_csv_entry(video_url, "unknown", "AUTH_FAILED", duration.total_seconds(), str(e))
+                    duration = time.monotonic() - start_time
+                    write_csv_entry(video_url, "unknown", "AUTH_FAILED", duration, str(e))
                     return False, False
-            
-            duration = datetime.now() - start_time
-            logger.error(f"❌ Failed to download {video_url} after {duration.total_seconds():.2f}s (attempt {attempt + 1}): {e}")
-            
+
+            duration = time.monotonic() - start_time
+            logger.error(f"❌ Failed to download {video_url} after {duration:.2f}s (attempt {attempt + 1}): {e}")
+
             if attempt == max_retries - 1:  # Last attempt
-                write_csv_entry(video_url, "unknown", "DOWNLOAD_FAILED", duration.total_seconds(), str(e))
+                write_csv_entry(video_url, "unknown", "DOWNLOAD_FAILED", duration, str(e))
+                return False, False  # download failed
+
+        except Exception as e:
+            # Non-yt-dlp failures (GCS, filesystem) are never auth problems
+            duration = time.monotonic() - start_time
+            logger.error(f"❌ Failed to download {video_url} after {duration:.2f}s (attempt {attempt + 1}): {e}")
+
+            if attempt == max_retries - 1:  # Last attempt
+                write_csv_entry(video_url, "unknown", "DOWNLOAD_FAILED", duration, str(e))
                 return False, False  # download failed
     
     return False, False  # download failed
 
-def download_channel_audio_parallel(channel_url, download_path, max_workers, bucket):
+def _limited_download(video_url, download_path, bucket):
+    """Run one download under the adaptive concurrency limiter."""
+    limiter = _get_download_limiter()
+    limiter.acquire()
+    try:
+        download_success, upload_result = download_and_upload_video_audio(
+            video_url, download_path, bucket
+        )
+        limiter.record_result(error=not download_success)
+        return download_success, upload_result
+    except Exception:
+        limiter.record_result(error=True)
+        raise
+    finally:
+        limiter.release()
+
+def download_channel_audio_parallel(channel_url, download_path, max_workers, bucket, video_urls=None):
     """Downloads audio from all videos in a channel using parallel processing."""
     logger.info(f"🎬 Starting parallel download for channel: {channel_url}")
-    
-    # Get video URLs
-    video_urls = get_video_urls(channel_url)
-    
+
+    # Get video URLs (unless the caller already extracted them)
+    if video_urls is None:
+        video_urls = get_video_urls(channel_url)
+
     if not video_urls:
         logger.warning(f"⚠️ No videos found for channel: {channel_url}")
         return 0, 0, 0
     
     logger.info(f"📊 Found {len(video_urls)} videos to download")
-    
+
+    # One LIST up front makes every per-video existence check a set lookup
+    prefetch_existing_blobs(bucket, GCS_PREFIX)
+
     # Initialize counters
     successful_downloads = 0
     successful_uploads = 0
     failed_downloads = 0
-    
-    # Use ThreadPoolExecutor for parallel downloads
-    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+    upload_futures = []
+
+    # Pre-skip videos whose predicted blob name is already on GCS: no
+    # yt-dlp invocation, no metadata fetch, just a set lookup per video
+    entries = [e if isinstance(e, dict) else {'url': e} for e in video_urls]
+    to_download = []
+    for entry in entries:
+        candidate = _candidate_blob_name(entry.get('uploader'), entry.get('title'))
+        if candidate and _blob_known_to_exist(candidate):
+            write_csv_entry(entry['url'], candidate, "ALREADY_EXISTS", 0, "File already on GCS")
+            successful_downloads += 1
+            successful_uploads += 1
+        else:
+            to_download.append(entry['url'])
+
+    if len(to_download) < len(entries):
+        logger.info(f"⏭️ Skipped {len(entries) - len(to_download)} videos already on GCS")
+
+    # Pool is sized to the limiter's ceiling; the limiter's permits decide
+    # how many of these threads actually download at once
+    with concurrent.futures.ThreadPoolExecutor(max_workers=MAX_CONCURRENCY) as executor:
         # Submit all download tasks
         future_to_url = {
-            executor.submit(download_and_upload_video_audio, url, download_path, bucket): url
-            for url in video_urls
+            executor.submit(_limited_download, url, download_path, bucket): url
+            for url in to_download
         }
-        
+
         # Process completed downloads
         for future in concurrent.futures.as_completed(future_to_url):
             url = future_to_url[future]
             try:
-                download_success, upload_success = future.result()
-                
+                download_success, upload_result = future.result()
+
                 if download_success:
                     successful_downloads += 1
-                    if upload_success:
+                    # Uploads running on the upload pool come back as futures
+                    if isinstance(upload_result, concurrent.futures.Future):
+                        upload_futures.append(upload_result)
+                    elif upload_result:
                         successful_uploads += 1
                 else:
                     failed_downloads += 1
-                    
+
             except Exception as exc:
                 logger.error(f"❌ {url} generated an exception: {exc}")
                 failed_downloads += 1
-    
+
+    # Drain in-flight uploads before reporting the channel summary
+    for upload_future in concurrent.futures.as_completed(upload_futures):
+        try:
+            if upload_future.result():
+                successful_uploads += 1
+        except Exception as exc:
+            logger.error(f"❌ Upload task generated an exception: {exc}")
+
     logger.info(f"🏁 Channel download completed: {channel_url}")
     logger.info(f"📊 Summary: {successful_downloads} successful downloads, {successful_uploads} successful uploads, {failed_downloads} failed")
     
@@ -359,7 +1027,10 @@ def download_channel_audio_parallel(channel_url, download_path, max_workers, buc
 def main():
     """Main function to run the download process."""
     logger.info("🎬 Starting YouTube download script v2 (cookies-from-browser)")
-    
+
+    # Make sure the shared cookie file exists before any yt-dlp call
+    ensure_fresh_cookies()
+
     # Initialize GCS client
     storage_client, bucket = initialize_gcs_client()
     if not bucket:
@@ -373,17 +1044,36 @@ def main():
     total_uploads = 0
     total_failed = 0
     
-    for channel_url in CHANNEL_URLS:
-        logger.info(f"🎬 Processing channel: {channel_url}")
-        
-        downloads, uploads, failed = download_channel_audio_parallel(
-            channel_url, DOWNLOAD_DIRECTORY, MAX_WORKERS, bucket
-        )
-        
-        total_downloads += downloads
-        total_uploads += uploads
-        total_failed += failed
-    
+    # Extract playlists for every channel up front on their own pool, so
+    # later channels' crawls (often tens of seconds each) overlap with the
+    # downloads already running instead of serializing in front of them
+    with concurrent.futures.ThreadPoolExecutor(
+        max_workers=min(len(CHANNEL_URLS), 4) or 1, thread_name_prefix='extract'
+    ) as extract_pool:
+        url_futures = {
+            extract_pool.submit(get_video_urls, channel_url): channel_url
+            for channel_url in CHANNEL_URLS
+        }
+
+        for future in concurrent.futures.as_completed(url_futures):
+            channel_url = url_futures[future]
+            try:
+                video_urls = future.result()
+            except Exception as exc:
+                logger.error(f"❌ Failed to extract video list for {channel_url}: {exc}")
+                continue
+
+            logger.info(f"🎬 Processing channel: {channel_url}")
+
+            downloads, uploads, failed = download_channel_audio_parallel(
+                channel_url, DOWNLOAD_DIRECTORY, MAX_WORKERS, bucket,
+                video_urls=video_urls
+            )
+
+            total_downloads += downloads
+            total_uploads += uploads
+            total_failed += failed
+
     # Final summary
     logger.info("🎉 Download process completed!")
     logger.info(f"📊 Final Summary:")
@@ -5,9 +5,11 @@ Samples 100 audio files (1 per subfolder) and reports sample rate and bit rate.
 """
 
 import os
-import glob
 import random
 import csv
+import atexit
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 import logging
 from pathlib import Path
@@ -27,39 +29,217 @@ CSV_FILE = 'audio_metadata_sample.csv'
 CSV_HEADERS = ['timestamp', 'file_path', 'folder_name', 'file_size_bytes', 'duration_seconds', 
                'sample_rate_hz', 'bit_rate_kbps', 'channels', 'format']
 
+# One long-lived, block-buffered handle instead of an open/close (and an
+# exists() stat) per row; closed via atexit so buffered rows are flushed.
+_csv_lock = threading.Lock()
+_csv_fp = None
+_csv_writer = None
+
+def _get_csv_writer():
+    """
+    Open the CSV file once, writing the header if the file is new.
+    """
+    global _csv_fp, _csv_writer
+    if _csv_writer is None:
+        try:
+            write_header = os.stat(CSV_FILE).st_size == 0
+        except OSError:
+            write_header = True
+        _csv_fp = open(CSV_FILE, 'a', newline='', buffering=65536, encoding='utf-8')
+        _csv_writer = csv.writer(_csv_fp)
+        if write_header:
+            _csv_writer.writerow(CSV_HEADERS)
+        atexit.register(_csv_fp.close)
+    return _csv_writer
+
 def write_csv_entry(file_path, folder_name, file_size, duration, sample_rate, bit_rate, channels, format_info):
     """
     Writes metadata entry to CSV file.
     """
     timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
     row = [timestamp, file_path, folder_name, file_size, duration, sample_rate, bit_rate, channels, format_info]
-    
-    # Create file with headers if it doesn't exist
-    file_exists = os.path.exists(CSV_FILE)
-    
-    with open(CSV_FILE, 'a', newline='', encoding='utf-8') as csvfile:
-        writer = csv.writer(csvfile)
-        if not file_exists:
-            writer.writerow(CSV_HEADERS)
-        writer.writerow(row)
+
+    with _csv_lock:
+        _get_csv_writer().writerow(row)
+
+def write_csv_entries(rows):
+    """
+    Writes a batch of pre-built (un-timestamped) rows in one writerows call.
+    """
+    timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    with _csv_lock:
+        _get_csv_writer().writerows([timestamp] + row for row in rows)
+
+# The fields we report all live in the first frame header (MP3) or the moov
+# atom (M4A), so parse them directly and only fall back to mutagen's full
+# tag/atom scan when the fast path can't find them.
+_MP3_PREFIX_BYTES = 64 * 1024
+
+# Layer III bitrate (kbps) and sample-rate tables, indexed by the header's
+# version bits (3 = MPEG-1, 2 = MPEG-2, 0 = MPEG-2.5)
+_MP3_BITRATES = {
+    3: (0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320),
+    2: (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+    0: (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+}
+_MP3_SAMPLE_RATES = {
+    3: (44100, 48000, 32000),
+    2: (22050, 24000, 16000),
+    0: (11025, 12000, 8000),
+}
+
+def _parse_mp3_header(data, file_size):
+    """
+    Parse sample rate, bit rate and channels from the first MP3 frame header.
+
+    Skips a leading ID3v2 tag, reads the Xing/Info frame count for an exact
+    VBR duration when present, and otherwise estimates duration from the
+    frame bitrate. Returns None if no valid frame header is found.
+    """
+    offset = 0
+    if data[:3] == b'ID3' and len(data) >= 10:
+        # ID3v2 size is a 28-bit syncsafe integer
+        offset = 10 + ((data[6] & 0x7f) << 21 | (data[7] & 0x7f) << 14 |
+                       (data[8] & 0x7f) << 7 | (data[9] & 0x7f))
+
+    i = offset
+    while i + 4 <= len(data):
+        if data[i] == 0xFF and (data[i + 1] & 0xE0) == 0xE0:
+            header = int.from_bytes(data[i:i + 4], 'big')
+            version_bits = (header >> 19) & 0x3
+            layer_bits = (header >> 17) & 0x3
+            bitrate_idx = (header >> 12) & 0xF
+            samplerate_idx = (header >> 10) & 0x3
+            channel_mode = (header >> 6) & 0x3
+
+            if (version_bits != 1 and layer_bits == 1
+                    and bitrate_idx not in (0, 15) and samplerate_idx != 3):
+                sample_rate = _MP3_SAMPLE_RATES[version_bits][samplerate_idx]
+                bit_rate_kbps = _MP3_BITRATES[version_bits][bitrate_idx]
+                channels = 1 if channel_mode == 3 else 2
+                samples_per_frame = 1152 if version_bits == 3 else 576
+
+                duration = None
+                xing = data.find(b'Xing', i, i + 256)
+                if xing == -1:
+                    xing = data.find(b'Info', i, i + 256)
+                if xing != -1 and len(data) >= xing + 12:
+                    flags = int.from_bytes(data[xing + 4:xing + 8], 'big')
+                    if flags & 1:  # frame count present
+                        frames = int.from_bytes(data[xing + 8:xing + 12], 'big')
+                        duration = frames * samples_per_frame / sample_rate
+                if duration is None:
+                    duration = (file_size - i) * 8 / (bit_rate_kbps * 1000)
+
+                return {
+                    'duration_seconds': duration,
+                    'sample_rate_hz': sample_rate,
+                    'bit_rate_kbps': bit_rate_kbps,
+                    'channels': channels,
+                }
+        i += 1
+
+    return None
+
+def _parse_m4a_atoms(f, file_size):
+    """
+    Parse sample rate, channels and duration from an M4A's moov atom.
+
+    Walks the top-level atoms (seeking over mdat, so a trailing moov costs
+    two reads), then pulls timescale/duration from mvhd and channel count
+    plus sample rate from the mp4a sample entry. Returns None when the moov
+    atom can't be located.
+    """
+    moov = None
+    pos = 0
+    while pos + 8 <= file_size:
+        f.seek(pos)
+        header = f.read(8)
+        if len(header) < 8:
+            break
+        size = int.from_bytes(header[:4], 'big')
+        atom_type = header[4:8]
+        if size == 1:  # 64-bit extended size
+            size = int.from_bytes(f.read(8), 'big')
+        if size < 8:
+            break
+        if atom_type == b'moov':
+            moov = f.read(size - 8)
+            break
+        pos += size
+
+    if not moov:
+        return None
+
+    duration = None
+    idx = moov.find(b'mvhd')
+    if idx != -1:
+        version = moov[idx + 4]
+        if version == 1:
+            timescale = int.from_bytes(moov[idx + 24:idx + 28], 'big')
+            raw_duration = int.from_bytes(moov[idx + 28:idx + 36], 'big')
+        else:
+            timescale = int.from_bytes(moov[idx + 16:idx + 20], 'big')
+            raw_duration = int.from_bytes(moov[idx + 20:idx + 24], 'big')
+        if timescale:
+            duration = raw_duration / timescale
+
+    sample_rate = None
+    channels = None
+    idx = moov.find(b'mp4a')
+    if idx != -1 and len(moov) >= idx + 30:
+        channels = int.from_bytes(moov[idx + 20:idx + 22], 'big')
+        sample_rate = int.from_bytes(moov[idx + 28:idx + 30], 'big')
+
+    if duration is None and sample_rate is None:
+        return None
+
+    bit_rate_kbps = None
+    if duration:
+        bit_rate_kbps = int(file_size * 8 / duration) // 1000
+
+    return {
+        'duration_seconds': duration,
+        'sample_rate_hz': sample_rate,
+        'bit_rate_kbps': bit_rate_kbps,
+        'channels': channels,
+    }
 
 def get_audio_metadata(file_path):
     """
     Extract metadata from an audio file (MP3 or M4A).
-    
+
     Args:
         file_path: Path to the audio file
-        
+
     Returns:
         dict: Metadata including sample rate, bit rate, duration, etc.
     """
     try:
         # Get file size
         file_size = os.path.getsize(file_path)
-        
+
         # Determine file format and load appropriate metadata
         file_ext = os.path.splitext(file_path)[1].lower()
-        
+
+        # Fast path: read just the headers we need
+        parsed = None
+        if file_ext in ('.mp3', '.m4a'):
+            try:
+                with open(file_path, 'rb') as f:
+                    if file_ext == '.mp3':
+                        parsed = _parse_mp3_header(f.read(_MP3_PREFIX_BYTES), file_size)
+                    else:
+                        parsed = _parse_m4a_atoms(f, file_size)
+            except OSError as e:
+                logger.warning(f"⚠️ Fast header parse failed for {file_path}: {e}")
+
+        if parsed:
+            parsed['file_size_bytes'] = file_size
+            parsed['format'] = 'MP3' if file_ext == '.mp3' else 'M4A'
+            return parsed
+
+        # Fall back to mutagen's full parse when the headers weren't found
         if file_ext == '.mp3':
             # Load MP3 file with mutagen
             audio = MP3(file_path)
@@ -102,55 +282,63 @@ def get_audio_metadata(file_path):
 
 def find_audio_folders(base_dir="podcasts"):
     """
-    Find all folders containing MP3 or M4A files.
-    
+    Find all folders containing MP3 or M4A files in a single scandir pass.
+
     Args:
         base_dir: Base directory to search
-        
+
     Returns:
-        list: List of folder paths that contain audio files
+        dict: Folder path -> list of audio file paths in that folder
     """
     if not os.path.exists(base_dir):
         logger.error(f"❌ Directory {base_dir} does not exist")
-        return []
-    
-    # Find all directories that contain audio files
-    audio_folders = []
-    
-    for root, dirs, files in os.walk(base_dir):
-        # Check if this directory contains MP3 or M4A files
-        audio_files = [f for f in files if f.lower().endswith(('.mp3', '.m4a'))]
+        return {}
+
+    # One DFS records the audio files per folder as it goes, so sampling
+    # never has to re-list (and re-stat) the chosen directories
+    audio_folders = {}
+    stack = [base_dir]
+
+    while stack:
+        current = stack.pop()
+        audio_files = []
+        try:
+            with os.scandir(current) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif entry.name.lower().endswith(('.mp3', '.m4a')):
+                        audio_files.append(entry.path)
+        except OSError as e:
+            logger.warning(f"⚠️ Could not scan {current}: {e}")
+            continue
+
         if audio_files:
-            audio_folders.append(root)
-    
+            audio_folders[current] = audio_files
+
     logger.info(f"📁 Found {len(audio_folders)} folders containing audio files")
     return audio_folders
 
-def sample_audio_files(folders, sample_size=100):
+def sample_audio_files(audio_folders, sample_size=100):
     """
-    Sample audio files from folders (1 per folder).
-    
+    Sample audio files (1 per folder) from the collected folder listing.
+
     Args:
-        folders: List of folder paths
+        audio_folders: Mapping of folder path -> audio file paths
         sample_size: Maximum number of files to sample
-        
+
     Returns:
         list: List of (folder_path, audio_file_path) tuples
     """
-    samples = []
-    
     # Shuffle folders to get random sampling
+    folders = list(audio_folders)
     random.shuffle(folders)
-    
-    for folder in folders[:sample_size]:
-        # Find audio files in this folder
-        audio_files = glob.glob(os.path.join(folder, "*.mp3")) + glob.glob(os.path.join(folder, "*.m4a"))
-        
-        if audio_files:
-            # Randomly select one audio file from this folder
-            selected_file = random.choice(audio_files)
-            samples.append((folder, selected_file))
-    
+
+    samples = [
+        (folder, random.choice(audio_folders[folder]))
+        for folder in folders[:sample_size]
+    ]
+
     logger.info(f"📊 Sampled {len(samples)} audio files from {len(samples)} folders")
     return samples
 
@@ -168,31 +356,50 @@ def analyze_metadata(samples):
     successful_count = 0
     failed_count = 0
     format_counts = {'MP3': 0, 'M4A': 0}
-    
-    for folder_path, audio_file in samples:
-        logger.info(f"🔍 Analyzing: {os.path.basename(audio_file)}")
-        
-        metadata = get_audio_metadata(audio_file)
-        
+
+    # Header parsing is dominated by file-open latency and mutagen releases
+    # the GIL during I/O, so fan the samples out over a thread pool
+    max_workers = min(16, len(samples)) or 1
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        future_to_sample = {
+            executor.submit(get_audio_metadata, audio_file): (folder_path, audio_file)
+            for folder_path, audio_file in samples
+        }
+
+        results = []
+        for future in as_completed(future_to_sample):
+            folder_path, audio_file = future_to_sample[future]
+            logger.info(f"🔍 Analyzed: {os.path.basename(audio_file)}")
+            try:
+                results.append((folder_path, audio_file, future.result()))
+            except Exception as e:
+                logger.error(f"❌ Failed to extract metadata from {audio_file}: {e}")
+                results.append((folder_path, audio_file, None))
+
+    csv_rows = []
+    for folder_path, audio_file, metadata in results:
         if metadata:
             # Add folder and file info
             folder_name = os.path.basename(folder_path)
             metadata['file_path'] = audio_file
             metadata['folder_name'] = folder_name
-            
+
             metadata_list.append(metadata)
             successful_count += 1
             format_counts[metadata['format']] += 1
-            
-            # Write to CSV
-            write_csv_entry(
+
+            csv_rows.append([
                 audio_file, folder_name, metadata['file_size_bytes'],
                 metadata['duration_seconds'], metadata['sample_rate_hz'],
                 metadata['bit_rate_kbps'], metadata['channels'], metadata['format']
-            )
+            ])
         else:
             failed_count += 1
-    
+
+    # One writerows call amortizes the lock and buffered writes over the batch
+    if csv_rows:
+        write_csv_entries(csv_rows)
+
     # Calculate summary statistics
     if metadata_list:
         sample_rates = [m['sample_rate_hz'] for m in metadata_list if m['sample_rate_hz']]
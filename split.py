@@ -6,12 +6,42 @@ This helps distribute work evenly across multiple download processes.
 """
 
 import yt_dlp
+import heapq
 import os
 import json
 import logging
+import sqlite3
+import subprocess
+import threading
+import time
 from datetime import datetime
 import argparse
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+# orjson serializes in C, ~an order of magnitude faster than the stdlib for
+# the big summary/analysis dumps; fall back quietly when it isn't installed
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def _dump_json(obj, path):
+    """Write obj as indented JSON, via orjson when available."""
+    if orjson is not None:
+        with open(path, 'wb') as f:
+            f.write(orjson.dumps(obj, option=orjson.OPT_INDENT_2))
+    else:
+        with open(path, 'w') as f:
+            json.dump(obj, f, indent=2)
+
+def _load_json(path):
+    """Read a JSON file, via orjson when available."""
+    if orjson is not None:
+        with open(path, 'rb') as f:
+            return orjson.loads(f.read())
+    with open(path, 'r') as f:
+        return json.load(f)
 
 # Setup logging
 logging.basicConfig(
@@ -33,30 +63,112 @@ def get_channel_urls():
         logger.error("❌ channel_urls.txt file not found")
         return []
 
+# Counting a channel costs a full flat-playlist extraction over the network,
+# and channel sizes barely move day to day, so counts are memoized on disk
+# and reused within the TTL.
+SPLIT_CACHE_DB = './.split_cache.db'
+SPLIT_CACHE_TTL_SECONDS = 86400
+
+_cache_lock = threading.Lock()
+_cache_conn = None
+
+def _count_cache():
+    """Open the shared cache connection on first use."""
+    global _cache_conn
+    if _cache_conn is None:
+        _cache_conn = sqlite3.connect(
+            SPLIT_CACHE_DB, isolation_level=None, check_same_thread=False
+        )
+        _cache_conn.execute('PRAGMA journal_mode=WAL')
+        _cache_conn.execute(
+            'CREATE TABLE IF NOT EXISTS counts (url TEXT PRIMARY KEY, count INT, ts REAL)'
+        )
+    return _cache_conn
+
+def _cached_count(channel_url):
+    """Return a fresh cached count for the channel, or None."""
+    with _cache_lock:
+        row = _count_cache().execute(
+            'SELECT count, ts FROM counts WHERE url = ?', (channel_url,)
+        ).fetchone()
+    if row and time.time() - row[1] < SPLIT_CACHE_TTL_SECONDS:
+        return row[0]
+    return None
+
+def _store_count(channel_url, video_count):
+    """Record a successfully fetched count."""
+    with _cache_lock:
+        _count_cache().execute(
+            'INSERT OR REPLACE INTO counts VALUES (?, ?, ?)',
+            (channel_url, video_count, time.time())
+        )
+
+def _count_flat_playlist(channel_url):
+    """
+    Count a channel's entries with a yt-dlp subprocess.
+
+    The full flat listing is the expensive path; running it as `yt-dlp
+    --flat-playlist --print id` and counting the printed lines keeps the
+    listing out of this process entirely — the counting threads just wait
+    on a pipe, so they overlap without contending on the GIL, and no
+    entry list is ever materialized here.
+
+    Raises on a non-zero exit with yt-dlp's stderr as the message, so the
+    caller's auth detection and retry loop work unchanged.
+    """
+    result = subprocess.run(
+        ['yt-dlp', '--cookies', 'cookies.txt', '--flat-playlist',
+         '--skip-download', '--no-warnings', '--print', 'id', channel_url],
+        capture_output=True, text=True, timeout=600,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip() or
+                           f"yt-dlp exited with {result.returncode}")
+    return sum(1 for line in result.stdout.splitlines() if line.strip())
+
 def count_videos_in_channel(channel_url):
-    """Count the number of videos in a YouTube channel."""
+    """Count the number of videos in a YouTube channel.
+
+    Returns the count, or None when every attempt failed — callers treat
+    None as "unknown, retry later" rather than a real zero.
+    """
+    cached = _cached_count(channel_url)
+    if cached is not None:
+        logger.info(f"📂 Using cached count for {channel_url}: {cached} videos")
+        return cached
+
     logger.info(f"🔍 Counting videos in: {channel_url}")
     start_time = datetime.now()
-    
-    ydl_opts = {
+
+    # Only the count is needed: stop the playlist at one entry and read the
+    # reported total instead of fetching every entry just to len() them
+    fast_opts = {
         'cookiefile': 'cookies.txt',  # Use cookies.txt file
-        'extract_flat': 'in_playlist',
+        'extract_flat': True,
+        'playlistend': 1,
         'quiet': True,
     }
-    
+
     max_retries = 3
     for attempt in range(max_retries):
         try:
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+            with yt_dlp.YoutubeDL(fast_opts) as ydl:
                 info_dict = ydl.extract_info(channel_url, download=False)
-                if 'entries' in info_dict:
-                    video_count = len([entry for entry in info_dict['entries'] if entry])
-                    duration = datetime.now() - start_time
-                    logger.info(f"✅ Found {video_count} videos in {channel_url} (took {duration.total_seconds():.2f}s)")
-                    return video_count
-                else:
+
+            video_count = info_dict.get('playlist_count') or info_dict.get('n_entries')
+
+            if video_count is None:
+                # Extractor didn't report a total; fall back to a full
+                # flat listing in a subprocess
+                video_count = _count_flat_playlist(channel_url)
+                if video_count == 0:
                     logger.warning(f"⚠️ No video entries found for {channel_url}")
                     return 0
+
+            duration = datetime.now() - start_time
+            logger.info(f"✅ Found {video_count} videos in {channel_url} (took {duration.total_seconds():.2f}s)")
+            _store_count(channel_url, video_count)
+            return video_count
                     
         except Exception as e:
             error_message = str(e).lower()
@@ -69,34 +181,106 @@ def count_videos_in_channel(channel_url):
                     continue
                 else:
                     logger.error("❌ Max authentication retries reached")
-                    return 0
-            
+                    return None
+
             logger.error(f"❌ Could not count videos for {channel_url} (attempt {attempt + 1}): {e}")
-            
+
             if attempt == max_retries - 1:
-                return 0
-    
-    return 0
+                return None
+
+    return None
+
+# Each finished channel is appended (and flushed) to this JSON-lines file so
+# an interrupted analysis resumes where it stopped instead of re-fetching
+# every channel.
+ANALYSIS_PROGRESS_FILE = 'channel_analysis.jsonl'
+
+def _load_analysis_progress():
+    """Load per-channel results from a previous (possibly interrupted) run."""
+    progress = {}
+    try:
+        with open(ANALYSIS_PROGRESS_FILE, 'rb') as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                record = orjson.loads(line) if orjson is not None else json.loads(line)
+                progress[record.pop('url')] = record
+    except FileNotFoundError:
+        pass
+    return progress
+
+def _append_analysis_progress(f, channel_url, data):
+    """Append one finished channel to the progress file and flush it."""
+    record = {'url': channel_url, **data}
+    if orjson is not None:
+        f.write(orjson.dumps(record) + b'\n')
+    else:
+        f.write((json.dumps(record) + '\n').encode())
+    f.flush()
 
 def analyze_channels(channel_urls):
     """Analyze all channels and count their videos."""
     logger.info(f"📊 Analyzing {len(channel_urls)} channels...")
-    
+
     channel_data = {}
     total_videos = 0
-    
-    for i, channel_url in enumerate(channel_urls, 1):
-        logger.info(f"📊 Processing channel {i}/{len(channel_urls)}: {channel_url}")
-        
-        video_count = count_videos_in_channel(channel_url)
-        
-        channel_data[channel_url] = {
-            'video_count': video_count,
-            'channel_name': channel_url.split('/')[-1] if '/' in channel_url else channel_url
+
+    # Resume from whatever an earlier interrupted run already fetched
+    progress = _load_analysis_progress()
+    remaining = []
+    for channel_url in channel_urls:
+        if channel_url in progress:
+            channel_data[channel_url] = progress[channel_url]
+            total_videos += progress[channel_url]['video_count']
+        else:
+            remaining.append(channel_url)
+    if channel_data:
+        logger.info(f"📂 Resumed {len(channel_data)} channels from {ANALYSIS_PROGRESS_FILE}")
+
+    # Each count blocks on the network for seconds, so fan the channels out
+    # over threads; count_videos_in_channel builds its own YoutubeDL, so the
+    # workers share no state
+    failed_channels = 0
+    max_workers = min(16, len(remaining)) or 1
+    with open(ANALYSIS_PROGRESS_FILE, 'ab') as progress_f, \
+            ThreadPoolExecutor(max_workers=max_workers) as executor:
+        future_to_url = {
+            executor.submit(count_videos_in_channel, channel_url): channel_url
+            for channel_url in remaining
         }
-        
-        total_videos += video_count
-    
+
+        for i, future in enumerate(as_completed(future_to_url), 1):
+            channel_url = future_to_url[future]
+            logger.info(f"📊 Processed channel {i}/{len(remaining)}: {channel_url}")
+
+            video_count = future.result()
+
+            channel_data[channel_url] = {
+                'video_count': video_count if video_count is not None else 0,
+                'channel_name': channel_url.split('/')[-1] if '/' in channel_url else channel_url
+            }
+            if video_count is None:
+                # Failed lookups count as 0 for this run's split but are not
+                # persisted, so a restart retries them instead of pinning the
+                # zero forever
+                failed_channels += 1
+                logger.warning(f"⚠️ Count failed for {channel_url}; will retry on the next run")
+                continue
+            _append_analysis_progress(progress_f, channel_url, channel_data[channel_url])
+
+            total_videos += video_count
+
+    if failed_channels == 0:
+        # The resume file has done its job once every channel succeeded;
+        # leaving it behind would make future runs skip the JSONL forever
+        # and never consult the TTL'd count cache again
+        try:
+            os.remove(ANALYSIS_PROGRESS_FILE)
+        except OSError:
+            pass
+    else:
+        logger.warning(f"⚠️ {failed_channels} channels failed to count; keeping {ANALYSIS_PROGRESS_FILE} for resume")
+
     logger.info(f"✅ Analysis complete! Total videos across all channels: {total_videos}")
     return channel_data, total_videos
 
@@ -106,26 +290,31 @@ def split_channels_balanced(channel_data, num_groups):
     
     # Sort channels by video count (descending)
     sorted_channels = sorted(channel_data.items(), key=lambda x: x[1]['video_count'], reverse=True)
-    
+
     # Initialize groups
     groups = [[] for _ in range(num_groups)]
     group_video_counts = [0] * num_groups
-    
-    # Distribute channels using greedy approach
+
+    # Distribute channels greedily; a heap finds the lightest group in
+    # O(log k) instead of a linear min+index scan per channel
+    heap = [(0, i) for i in range(num_groups)]
+    heapq.heapify(heap)
+
     for channel_url, data in sorted_channels:
-        # Find group with minimum video count
-        min_group_idx = group_video_counts.index(min(group_video_counts))
-        
-        # Add channel to that group
+        count, min_group_idx = heapq.heappop(heap)
+
+        # Add channel to the lightest group
         groups[min_group_idx].append({
             'url': channel_url,
             'video_count': data['video_count'],
             'channel_name': data['channel_name']
         })
-        
+
         # Update group video count
-        group_video_counts[min_group_idx] += data['video_count']
-    
+        count += data['video_count']
+        group_video_counts[min_group_idx] = count
+        heapq.heappush(heap, (count, min_group_idx))
+
     return groups, group_video_counts
 
 def save_groups_to_files(groups, group_video_counts, output_dir="split_groups"):
@@ -159,8 +348,7 @@ def save_groups_to_files(groups, group_video_counts, output_dir="split_groups"):
         }
         summary['groups'].append(group_summary)
     
-    with open(summary_file, 'w') as f:
-        json.dump(summary, f, indent=2)
+    _dump_json(summary, summary_file)
     
     logger.info(f"📊 Summary saved to: {summary_file}")
 
@@ -209,8 +397,7 @@ def main():
     # Analyze channels (or load existing analysis)
     if args.skip_analysis and os.path.exists(args.analysis_file):
         logger.info(f"📂 Loading existing analysis from {args.analysis_file}")
-        with open(args.analysis_file, 'r') as f:
-            channel_data = json.load(f)
+        channel_data = _load_json(args.analysis_file)
         total_videos = sum(data['video_count'] for data in channel_data.values())
     else:
         logger.info("🔍 Analyzing channels...")
@@ -218,8 +405,7 @@ def main():
         
         # Save analysis
         logger.info(f"💾 Saving analysis to {args.analysis_file}")
-        with open(args.analysis_file, 'w') as f:
-            json.dump(channel_data, f, indent=2)
+        _dump_json(channel_data, args.analysis_file)
     
     # Split channels into groups
     groups, group_video_counts = split_channels_balanced(channel_data, args.groups)